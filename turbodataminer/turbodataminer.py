@@ -30,7 +30,6 @@ import os
 import csv
 import uuid
 import threading
-import time
 import re
 import base64
 import HTMLParser
@@ -78,6 +77,7 @@ from javax.swing.filechooser import FileNameExtensionFilter
 from javax.swing.event import DocumentListener
 from javax.swing import DefaultComboBoxModel
 from javax.swing import SwingUtilities
+from javax.swing import Timer
 from javax.swing.event import HyperlinkEvent;
 from java.awt import BorderLayout
 from java.awt import GridLayout
@@ -89,7 +89,6 @@ from java.lang import Integer
 from java.lang import String
 from java.lang import Float
 from java.lang import Thread
-from java.util import Date
 from java.lang import Boolean
 from java.net import URL
 from java.net import URLClassLoader
@@ -107,8 +106,10 @@ class IntelDataModelEntry:
 
     This class contains all information about a single table row.
     """
+    # Maps the type of an element to the column class reported to the JTable. All other types are displayed as String.
+    COLUMN_CLASSES = {bool: Boolean, float: Float, int: Integer, Boolean: Boolean, Float: Float, Integer: Integer}
 
-    def __init__(self, elements, message_info=None, message_infos={}):
+    def __init__(self, elements, message_info=None, message_infos=None):
         """
         :param elements: A list of items that were extracted from the request and/or response
         :param message_info: The IHttpRequestResponse from where the data elements were extracted
@@ -135,7 +136,7 @@ class IntelDataModelEntry:
                 self._elements.append(unicode(item))
         self._length = len(elements)
         self._message_info = message_info
-        self._message_infos = message_infos
+        self._message_infos = message_infos if message_infos is not None else {}
 
     @property
     def len(self):
@@ -165,17 +166,7 @@ class IntelDataModelEntry:
 
     def get_type_at(self, i):
         """Returns the element type at position i"""
-        return_value = String
-        value = self.get_value_at(i)
-        if isinstance(value, bool):
-            return_value = Boolean
-        elif isinstance(value, float):
-            return_value = Float
-        elif isinstance(value, int):
-            return_value = Integer
-        elif isinstance(value, time):
-            return_value = Date
-        return return_value
+        return IntelDataModelEntry.COLUMN_CLASSES.get(type(self.get_value_at(i)), String)
 
 
 class IntelDataModel(AbstractTableModel):
@@ -185,12 +176,64 @@ class IntelDataModel(AbstractTableModel):
     This class implements the data model to display information in the IntelTable. This class maintains a list of rows.
     Each row is represented by the class IntelDataModelEntry.
     """
+    # Time frame in milliseconds within which all added rows are reported to the JTable in a single event
+    ROWS_INSERTED_DELAY = 20
 
     def __init__(self):
         self._header = []
         self._content = []
         self._column_count = 0
         self._row_count = 0
+        self._column_classes = []
+        # Rows that were added but are not yet part of _content because they were not yet reported to the JTable
+        self._pending_entries = []
+        # Protects _content, _row_count and _pending_entries, which are updated by the analyzer threads and the EDT
+        self._content_lock = RLock()
+        self._pending_timer = Timer(IntelDataModel.ROWS_INSERTED_DELAY, self.flush_pending_rows)
+        self._pending_timer.setRepeats(False)
+
+    def flush_pending_rows(self, event=None):
+        """
+        Adds all rows, which were added since the last flush, to the data model and reports them to the JTable in a
+        single event
+        """
+        with self._content_lock:
+            self._pending_timer.stop()
+            if self._pending_entries:
+                entries = self._pending_entries
+                self._pending_entries = []
+                old_row_count = self._row_count
+                # If the column classes changed, then all rows are reported as changed so that the row sorter
+                # re-sorts the whole table using comparators for the new column classes.
+                if self._append_rows(entries):
+                    self.fireTableDataChanged()
+                else:
+                    self.fireTableRowsInserted(old_row_count, self._row_count - 1)
+
+    def _append_rows(self, entries):
+        """
+        Appends the given rows to the data model without notifying the JTable
+        :return: True if the type of at least one column changed
+        """
+        self._content.extend(entries)
+        old_row_count = self._row_count
+        self._row_count = len(self._content)
+        if old_row_count == 0 or len(self._column_classes) != self._column_count:
+            return self._update_column_classes()
+        return False
+
+    def _update_column_classes(self):
+        """
+        Determines the type of each column based on the first row and caches the result for method getColumnClass
+        :return: True if the type of at least one column changed
+        """
+        old_column_classes = self._column_classes
+        if self._row_count >= 1:
+            row = self._content[0]
+            self._column_classes = [row.get_type_at(i) for i in range(0, self._column_count)]
+        else:
+            self._column_classes = []
+        return old_column_classes != self._column_classes
 
     def set_header(self, header, reset_column_count=False):
         """
@@ -201,24 +244,34 @@ class IntelDataModel(AbstractTableModel):
         if not isinstance(header, list):
             raise ValueError("Variable 'header' must be a list!")
 
-        self._header = header
-        count = len(header)
-        if self._column_count <= count:
-            self._column_count = count
-        elif reset_column_count:
-            self._column_count = count
-        self.fireTableStructureChanged()
+        with self._content_lock:
+            old_column_count = self._column_count
+            old_header = self._header
+            self._header = header
+            count = len(header)
+            if self._column_count <= count:
+                self._column_count = count
+            elif reset_column_count:
+                self._column_count = count
+            # The table structure only has to be rebuilt if the header actually changed
+            if old_column_count != self._column_count or old_header != header:
+                self._update_column_classes()
+                self.fireTableStructureChanged()
         return True
 
     def get_header(self):
         return self._header
 
     def clear_data(self):
-        if self._row_count != 0:
-            self._content = []
-            old_row_count = self._row_count
-            self._row_count = 0
-            self.fireTableRowsDeleted(0, old_row_count - 1)
+        with self._content_lock:
+            self._pending_timer.stop()
+            self._pending_entries = []
+            if self._row_count != 0:
+                self._content = []
+                old_row_count = self._row_count
+                self._row_count = 0
+                self._column_classes = []
+                self.fireTableRowsDeleted(0, old_row_count - 1)
 
     def add_rows(self, entries):
         """
@@ -229,24 +282,58 @@ class IntelDataModel(AbstractTableModel):
         if not isinstance(entries, list):
             raise ValueError("Variable 'entries' must be a list!")
 
-        rows = 0
-        for entry in entries:
-            if self._column_count < entry.len:
-                self._column_count = entry.len
+        if not entries:
+            return
+        with self._content_lock:
+            column_count = max([entry.len for entry in entries])
+            if self._column_count < column_count:
+                # A structure change makes the JTable reload all rows, so the pending and the new rows are added at
+                # once and do not have to be announced separately.
+                self._column_count = column_count
+                self._pending_timer.stop()
+                entries = self._pending_entries + entries
+                self._pending_entries = []
+                self._append_rows(entries)
                 self.fireTableStructureChanged()
-            self._content.append(entry)
-            rows = rows + 1
-
-        old_row_count = self._row_count
-        self._row_count = self._row_count + rows
-        if rows > 0:
-            self.fireTableRowsInserted(old_row_count, self._row_count - 1)
+            else:
+                # Rows are usually added one by one by the analyzer threads. Thus, all rows that are added within
+                # ROWS_INSERTED_DELAY ms are collected and added to the data model by method flush_pending_rows,
+                # which reports them to the JTable in a single event.
+                self._pending_entries.extend(entries)
+                if SwingUtilities.isEventDispatchThread():
+                    self.flush_pending_rows()
+                elif not self._pending_timer.isRunning():
+                    self._pending_timer.start()
 
     def delete_row(self, row_index):
-        if row_index < self._row_count:
-            del self._content[row_index]
-            self._row_count = self._row_count - 1
-            self.fireTableRowsDeleted(row_index, row_index)
+        with self._content_lock:
+            if row_index < self._row_count:
+                del self._content[row_index]
+                self._row_count = self._row_count - 1
+                if row_index == 0 and self._update_column_classes():
+                    self.fireTableDataChanged()
+                else:
+                    self.fireTableRowsDeleted(row_index, row_index)
+
+    def delete_rows(self, row_indices):
+        """
+        Method used to delete multiple rows from the data model at once
+
+        :param row_indices: A list of model row indices that shall be deleted
+        """
+        with self._content_lock:
+            rows = set([i for i in row_indices if 0 <= i < self._row_count])
+            if rows:
+                self._content = [row for i, row in enumerate(self._content) if i not in rows]
+                self._row_count = len(self._content)
+                first_row = min(rows)
+                last_row = max(rows)
+                if first_row == 0 and self._update_column_classes():
+                    self.fireTableDataChanged()
+                elif last_row - first_row + 1 == len(rows):
+                    self.fireTableRowsDeleted(first_row, last_row)
+                else:
+                    self.fireTableDataChanged()
 
     def get_message_info_at(self, row_index):
         """Returns the message info at row_index"""
@@ -258,48 +345,30 @@ class IntelDataModel(AbstractTableModel):
 
     def getRowCount(self):
         """Returns the total number of rows managed by the data model"""
-        try:
-            return self._row_count
-        except:
-            print(traceback.format_exc())
-            return 0
+        return self._row_count
 
     def getColumnCount(self):
         """Returns the total number of columns managemed by the data model"""
-        try:
-            return self._column_count
-        except:
-            print(traceback.format_exc())
-            return 0
+        return self._column_count
 
     def getColumnName(self, column_index):
         """Returns the column name at position column_index"""
-        try:
-            if column_index < len(self._header):
-                return self._header[column_index]
-            return None
-        except:
-            print(traceback.format_exc())
-            return None
+        if column_index < len(self._header):
+            return self._header[column_index]
+        return None
 
     def getValueAt(self, row_index, column_index):
         """Returns the element at row row_index and column column_index"""
         try:
-            row = self._content[row_index]
-            if column_index < row.len:
-                return row.get_value_at(column_index)
+            return self._content[row_index].get_value_at(column_index)
         except:
             print(traceback.format_exc())
         return None
 
     def getColumnClass(self, column_index):
         """Returns the column type at column_index"""
-        try:
-            if self._row_count >= 1:
-                row = self._content[0]
-                return row.get_type_at(column_index)
-        except:
-            print(traceback.format_exc())
+        if column_index < len(self._column_classes):
+            return self._column_classes[column_index]
         return String
 
 
@@ -362,83 +431,96 @@ class IntelTable(JTable, IMessageEditorController):
         self._data_model = data_model
         self.setAutoCreateRowSorter(True)
         self._currently_selected_message_info = None
-        # table pop menu
-        self._popup_menu = JPopupMenu()
+        # table pop menu, which is created by method getComponentPopupMenu when it is requested for the first time
+        self._popup_menu = None
+
+    def _create_popup_menu(self):
+        """This method creates the table's popup menu"""
+        popup_menu = JPopupMenu()
         # Clear Table
         item = JMenuItem("Clear Table", actionPerformed=self.clear_table_menu_pressed)
         item.setToolTipText("Remove all rows from the table.")
-        self._popup_menu.add(item)
+        popup_menu.add(item)
         # Refresh Table
         item = JMenuItem("Refresh Table", actionPerformed=self.refresh_table_menu_pressed)
         item.setToolTipText("Synchronize the table with it's underlying data model.")
-        self._popup_menu.add(item)
-        self._popup_menu.addSeparator()
+        popup_menu.add(item)
+        popup_menu.addSeparator()
         # Export CSV
         item = JMenuItem("Export CSV", actionPerformed=self.export_csv_menu_pressed)
         item.setToolTipText("Export the content of the table to a CSV file.")
-        self._popup_menu.add(item)
-        self._popup_menu.addSeparator()
+        popup_menu.add(item)
+        popup_menu.addSeparator()
         # Copy Selected Row(s)
         item = JMenuItem("Copy Selected Row(s)", actionPerformed=self.copy_selected_values_menu_pressed)
         item.setToolTipText("Copy the selected rows into the clipboard. To obtain the content of the header row as "
                             "well, you can use menu item 'Copy Header Row'.")
-        self._popup_menu.add(item)
+        popup_menu.add(item)
         # Copy Header Row
         item = JMenuItem("Copy Header Row", actionPerformed=self.copy_header_row_menu_pressed)
         item.setToolTipText("You can use this menu item to copy and paste the table's header row. You can use this "
                             "function in combination with menu item 'Copy Selected Row(s)'.")
-        self._popup_menu.add(item)
+        popup_menu.add(item)
         # Copy Cell Value
         item = JMenuItem("Copy Cell Value", actionPerformed=self.copy_single_value_menu_pressed)
         item.setToolTipText("Copy the value of the cell on which you launched this menu item.")
-        self._popup_menu.add(item)
+        popup_menu.add(item)
         # Copy All Column Values
         item = JMenuItem("Copy All Column Values", actionPerformed=self.copy_all_column_values_menu_pressed)
         item.setToolTipText("Copy all values of the column on which you launched this menu item.")
-        self._popup_menu.add(item)
+        popup_menu.add(item)
         # Copy Selected Column Values
         item = JMenuItem("Copy Selected Column Values", actionPerformed=self.copy_selected_column_values_menu_pressed)
         item.setToolTipText("Copy the column values of all rows that are currently selected.")
-        self._popup_menu.add(item)
+        popup_menu.add(item)
         # Copy All Column Values (Deduplicated)
         item = JMenuItem("Copy All Column Values (Deduplicated)",
                          actionPerformed=self.copy_all_column_values_dedup_menu_pressed)
         item.setToolTipText("Like menu item 'Copy All Column Values' but only copies unique values into the clipboard.")
-        self._popup_menu.add(item)
+        popup_menu.add(item)
         # Copy Selected Column Values (Deduplicated)
         item = JMenuItem("Copy Selected Column Values (Deduplicated)",
                          actionPerformed=self.copy_selected_column_values_dedup_menu_pressed)
         item.setToolTipText("Like menu item 'Copy Selected Column Values' but only copies unique values into the "
                             "clipboard.")
-        self._popup_menu.add(item)
-        self._popup_menu.addSeparator()
+        popup_menu.add(item)
+        popup_menu.addSeparator()
         # Delete Selected Row(s)
         item = JMenuItem("Delete Selected Row(s)", actionPerformed=self.delete_rows_menu_pressed)
         item.setToolTipText("Removes the selected rows from the table.")
-        self._popup_menu.add(item)
-        self._popup_menu.addSeparator()
+        popup_menu.add(item)
+        popup_menu.addSeparator()
         # Add Selected Host(s) To Scope
         item = JMenuItem("Add Selected Host(s) To Scope", actionPerformed=self.include_hosts_in_scope)
         item.setToolTipText("Include the host names of the selected requests in scope")
-        self._popup_menu.add(item)
+        popup_menu.add(item)
         # Remove Selected Host(s) From Scope
         item = JMenuItem("Remove Selected Host(s) From Scope", actionPerformed=self.exclude_hosts_from_scope)
         item.setToolTipText("Exclude the host names of the selected requests from scope")
-        self._popup_menu.add(item)
-        self._popup_menu.addSeparator()
+        popup_menu.add(item)
+        popup_menu.addSeparator()
         # Send Selected Row(s) to Repeater
         item = JMenuItem("Send Selected Row(s) to Repeater", actionPerformed=self.send_to_repeater)
         item.setToolTipText("Send the request of the selected row to Burp Suite's Repeater for further analysis.")
-        self._popup_menu.add(item)
-        self.setComponentPopupMenu(self._popup_menu)
+        popup_menu.add(item)
+        return popup_menu
+
+    def getComponentPopupMenu(self):
+        """Returns the table's popup menu. The popup menu is created when it is requested for the first time."""
+        if self._popup_menu is None:
+            self._popup_menu = self._create_popup_menu()
+        return self._popup_menu
 
     def _setEnablePopupMenu(self, enabled):
+        if self._popup_menu is None:
+            return
         for item in self._popup_menu.getSubElements():
             item.setEnabled(enabled)
 
     def refresh_table_menu_pressed(self, event):
         """This methed is invoked when the refresh table menu is selected"""
         with self._table_model_lock:
+            self._data_model.flush_pending_rows()
             self._data_model.fireTableStructureChanged()
 
     def clear_data(self):
@@ -466,11 +548,13 @@ class IntelTable(JTable, IMessageEditorController):
                         except:
                             traceback.print_exc(file=self._intel_tab.callbacks.getStderr())
                         # Write content
-                        for row_index in range(0, self._data_model.getRowCount()):
+                        get_value_at = self._data_model.getValueAt
+                        column_count = self._data_model.getColumnCount()
+                        for row_index in xrange(0, self._data_model.getRowCount()):
                             row = []
                             try:
-                                for column_index in range(0, self._data_model.getColumnCount()):
-                                    value = unicode(self._data_model.getValueAt(row_index, column_index)).encode("ISO-8859-1")
+                                for column_index in xrange(0, column_count):
+                                    value = unicode(get_value_at(row_index, column_index)).encode("ISO-8859-1")
                                     row.append(value)
                             except:
                                 traceback.print_exc(file=self._intel_tab.callbacks.getStderr())
@@ -530,22 +614,29 @@ class IntelTable(JTable, IMessageEditorController):
         thread.daemon = True
         thread.start()
 
+    def _get_selected_model_rows(self):
+        """This method converts all currently selected view rows into model row indices in one pass"""
+        convert = self.convertRowIndexToModel
+        return [convert(selected_row) for selected_row in self.getSelectedRows()]
+
     def _copy_column_values_as_list(self, column_index, selected_rows_only=False):
         """This method returns all values of the given column_index as list"""
         with self._table_model_lock:
-            rows = [self.convertRowIndexToModel(selected_row) for selected_row in self.getSelectedRows()] \
-                if selected_rows_only else range(0, self._data_model.getRowCount())
-            items = [self._data_model.getValueAt(index, column_index) for index in rows]
+            rows = self._get_selected_model_rows() \
+                if selected_rows_only else xrange(0, self._data_model.getRowCount())
+            get_value_at = self._data_model.getValueAt
+            items = [get_value_at(index, column_index) for index in rows]
         return items
 
     def _copy_column_values_as_dict(self, column_index, selected_rows_only=False):
         """This method returns all values of the given column_index as dict"""
         items = {}
         with self._table_model_lock:
-            rows = [self.convertRowIndexToModel(selected_row) for selected_row in self.getSelectedRows()] \
-                if selected_rows_only else range(0, self._data_model.getRowCount())
+            rows = self._get_selected_model_rows() \
+                if selected_rows_only else xrange(0, self._data_model.getRowCount())
+            get_value_at = self._data_model.getValueAt
             for index in rows:
-                item = self._data_model.getValueAt(index, column_index)
+                item = get_value_at(index, column_index)
                 if item in items:
                     items[item] = items[item] + 1
                 else:
@@ -671,19 +762,13 @@ class IntelTable(JTable, IMessageEditorController):
         thread.daemon = True
         thread.start()
 
-    def _delete_rows_menu_pressed(self):
-        """This method is invoked by a thread when the delete rows button is pressed"""
-        self._setEnablePopupMenu(False)
+    def delete_rows_menu_pressed(self, event):
+        """This method is invoked when the delete rows button is pressed"""
         try:
             with self._table_model_lock:
-                selected_rows = self.getSelectedRows()
-                rows = []
-                for selected_row in selected_rows:
-                    model_row = self.convertRowIndexToModel(selected_row)
-                    rows.append(model_row)
-                rows.sort(reverse=True)
-                for i in rows:
-                    self._data_model.delete_row(i)
+                rows = self._get_selected_model_rows()
+                rows.sort()
+                self._data_model.delete_rows(rows)
             JOptionPane.showConfirmDialog(self._intel_tab.extender.parent,
                                           "Deleting the selected rows completed successfully.",
                                           "Deleting completed ...",
@@ -691,13 +776,6 @@ class IntelTable(JTable, IMessageEditorController):
         except:
             ErrorDialog.Show(self._intel_tab.extender.parent, traceback.format_exc())
             traceback.print_exc(file=self._intel_tab.callbacks.getStderr())
-        self._setEnablePopupMenu(True)
-
-    def delete_rows_menu_pressed(self, event):
-        """This method is invoked when the delete rows button is pressed"""
-        thread = threading.Thread(target=self._delete_rows_menu_pressed)
-        thread.daemon = True
-        thread.start()
 
     def _add_remove_scope(self, in_scope):
         """If true, then adds the given URL to scope, else the URL is excluded from scope"""
@@ -705,9 +783,7 @@ class IntelTable(JTable, IMessageEditorController):
         try:
             with self._table_model_lock:
                 dedup = {}
-                selected_rows = self.getSelectedRows()
-                for selected_row in selected_rows:
-                    model_row = self.convertRowIndexToModel(selected_row)
+                for model_row in self._get_selected_model_rows():
                     message_info = self._data_model.get_message_info_at(model_row)
                     if message_info:
                         http_service = message_info.getHttpService()
@@ -751,10 +827,8 @@ class IntelTable(JTable, IMessageEditorController):
         self._setEnablePopupMenu(False)
         try:
             with self._table_model_lock:
-                selected_rows = self.getSelectedRows()
                 id = 1
-                for selected_row in selected_rows:
-                    model_row = self.convertRowIndexToModel(selected_row)
+                for model_row in self._get_selected_model_rows():
                     message_info = self._data_model.get_message_info_at(model_row)
                     if message_info:
                         http_service = message_info.getHttpService()